@@ -7,17 +7,22 @@ and generates AI responses using a Chatbot agent powered by a local model.
 """
 
 import curses
+import itertools
+import queue
+import re
+import shlex
 import subprocess
 import threading
 import time
 import random
 import html
+
 import lxml.etree as ET
 
-from colorama import Fore, Back, Style  # Colorize terminal messages
-from langchain_ollama import OllamaLLM  # Local chatbot model
-from langchain_core.prompts import ChatPromptTemplate  # Chat prompt template
-from langchain_community.chat_models import ChatOllama  # Chat model for streaming responses
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 # ------------------------------------------------------------------------------
@@ -66,13 +71,9 @@ You are {chatbot_name}, a helpful AI assistant with access to a Linux terminal r
 # Utility Functions
 # ------------------------------------------------------------------------------
 
-def pad_string(text, length):
-    """
-    Pads or truncates the given text to exactly 'length' characters.
-    """
-    if len(text) > length:
-        return text[:length]
-    return text + (' ' * (length - len(text)))
+# Printable ASCII pool for the random tail, built once instead of one
+# chr(randrange(...)) call per appended character.
+_PRINTABLE = [chr(code) for code in range(33, 126)]
 
 
 def generate_edgy_text(base_text):
@@ -82,21 +83,68 @@ def generate_edgy_text(base_text):
     """
     if base_text is None:
         return None
+    if np is not None:
+        return _generate_edgy_text_numpy(base_text)
     text_chars = list(base_text)
     text_length = len(text_chars)
-    
+
     # Append a random number of random ASCII characters
-    extra_chars = [chr(random.randrange(33, 126)) for _ in range(random.randrange(0, int(50 * (0.97 ** text_length))))]
-    text_chars += extra_chars
-    
-    # Randomly replace some characters based on position probability
-    for i in range(text_length):
-        if random.uniform(0, 1) < (i / text_length) ** 4:
-            text_chars[i] = random.choice(text_chars)
-    
+    extra_budget = int(50 * (0.97 ** text_length))
+    if extra_budget > 0:
+        text_chars += random.choices(_PRINTABLE, k=random.randrange(0, extra_budget))
+
+    # Randomly replace some characters based on position probability.
+    # Bound method lookups are hoisted out of the loop since this runs once
+    # per character on every streamed update.
+    if text_length > 0:
+        rand = random.random
+        choice = random.choice
+        inv_length = 1.0 / text_length
+        for i in range(text_length):
+            if rand() < (i * inv_length) ** 4:
+                text_chars[i] = choice(text_chars)
+
     return "".join(text_chars)
 
 
+# Replacement-probability curves keyed by text length; repeated lengths
+# (re-rendered messages, same-size updates) skip the arange/power step.
+_EDGY_THRESHOLDS = {}
+_EDGY_THRESHOLDS_MAX = 1024
+
+
+def _edgy_thresholds(text_length):
+    thresholds = _EDGY_THRESHOLDS.get(text_length)
+    if thresholds is None:
+        if len(_EDGY_THRESHOLDS) >= _EDGY_THRESHOLDS_MAX:
+            _EDGY_THRESHOLDS.clear()
+        thresholds = (np.arange(text_length) / text_length) ** 4
+        _EDGY_THRESHOLDS[text_length] = thresholds
+    return thresholds
+
+
+def _generate_edgy_text_numpy(base_text):
+    """
+    Vectorized variant of generate_edgy_text: the per-character replacement
+    loop becomes a single mask/gather over a uint8 buffer.
+    """
+    text_bytes = np.frombuffer(base_text.encode('utf-8'), dtype=np.uint8).copy()
+    text_length = text_bytes.size
+
+    if text_length > 0:
+        mask = np.random.random(text_length) < _edgy_thresholds(text_length)
+        replacement_idx = np.random.randint(0, text_length, size=int(mask.sum()))
+        text_bytes[mask] = text_bytes[replacement_idx]
+
+    # Append a random number of random ASCII characters
+    extra_budget = int(50 * (0.97 ** text_length))
+    if extra_budget > 0:
+        extra = np.random.randint(33, 126, size=np.random.randint(0, extra_budget), dtype=np.uint8)
+        text_bytes = np.concatenate([text_bytes, extra])
+
+    return text_bytes.tobytes().decode('utf-8', 'ignore')
+
+
 # ------------------------------------------------------------------------------
 # UI Class
 # ------------------------------------------------------------------------------
@@ -116,9 +164,20 @@ class ChatUI:
         self.stdscr = stdscr
         self.client = client
         self.input_mode = False
+        self.input_done = threading.Event()  # Set when the user submits a line
         self.client.inbox_text = ""
         self.tick = 0
 
+        # Dirty-tracking state so the chat window is only redrawn when its
+        # content actually changed (new history entries, streaming updates,
+        # or an animation frame for a still-incomplete message).
+        self._last_history_len = -1
+        self._last_unfinished_state = None
+        self._last_input_display = None
+        # Current animation glyph, computed once per redraw rather than per
+        # message that happens to need it.
+        self._circle_frame = self._CIRCLE_FRAMES[0]
+
         # Configure curses settings
         curses.curs_set(1)
         curses.start_color()
@@ -127,15 +186,125 @@ class ChatUI:
         for idx, chat_client in enumerate(self.chat_server.chat_clients):
             curses.init_pair(idx + 1, chat_client.foreground_color, chat_client.background_color)
 
+        # Color pair index per client, so display_message avoids a linear
+        # scan of chat_clients for every rendered message.
+        self._client_color_idx = {
+            chat_client: idx + 1
+            for idx, chat_client in enumerate(self.chat_server.chat_clients)
+        }
+        # Resolved color-pair attributes, so the render loop does not call
+        # curses.color_pair per message.
+        self._color_pairs = [
+            curses.color_pair(idx)
+            for idx in range(len(self.chat_server.chat_clients) + 1)
+        ]
+
         # Setup windows for chat display and input area
         self.height, self.width = self.stdscr.getmaxyx()
+        self._wrap_width = self.width - 4
         self.chat_win = curses.newwin(self.height - 3, self.width, 0, 0)
         self.input_win = curses.newwin(3, self.width, self.height - 3, 0)
+        # Bounded getch so typing mode cannot stall the render loop
+        self.input_win.timeout(100)
 
     def update_ui(self):
         """
         Refresh the UI windows with the latest chat messages and user input.
+        Each window is only redrawn when its own content changed, so typing
+        touches the input window alone.
+        """
+        if self.stdscr.getmaxyx() != (self.height, self.width):
+            self.handle_resize()
+
+        drew = False
+        if self.is_chat_dirty():
+            self.redraw_chat_window()
+            drew = True
+        drew = self.redraw_input_window() or drew
+        if drew:
+            # Windows mark themselves with noutrefresh; one doupdate pushes
+            # everything to the terminal in a single write.
+            curses.doupdate()
+        if self.input_mode:
+            self.handle_input_key()
+
+    def redraw_input_window(self):
+        """
+        Redraws the input window, skipping the work when the displayed text
+        has not changed since the last frame. Returns True if it drew.
+        """
+        input_display = "You: " + self.client.inbox_text[:self.width - 8]
+        if input_display == self._last_input_display:
+            return False
+        self._last_input_display = input_display
+        self.input_win.clear()
+        self.input_win.border()
+        self.input_win.addstr(1, 2, input_display, curses.color_pair(1))
+        self.input_win.noutrefresh()
+        return True
+
+    def handle_input_key(self):
         """
+        Reads and applies a single key press while in input mode.
+        """
+        key = self.input_win.getch()
+        if key == curses.KEY_RESIZE:
+            self.handle_resize()
+        elif key == 10:  # Enter key
+            self.input_mode = False
+            self.input_done.set()
+        elif key in (127, 8, curses.KEY_BACKSPACE):  # Backspace key
+            self.client.pop_inbox_char()
+        elif 32 <= key <= 126 and len(self.client._inbox_buf) < self.width - 8:  # Printable characters
+            self.client.append_inbox_char(chr(key))
+
+    def handle_resize(self):
+        """
+        Recomputes the window geometry after a terminal resize and forces a
+        full redraw. Cached wrapped lines invalidate themselves because they
+        carry the width they were computed for.
+        """
+        curses.update_lines_cols()
+        self.height, self.width = self.stdscr.getmaxyx()
+        self._wrap_width = self.width - 4
+        self.chat_win.resize(self.height - 3, self.width)
+        self.input_win.resize(3, self.width)
+        self.input_win.mvwin(self.height - 3, 0)
+        self._last_history_len = -1
+        self._last_unfinished_state = None
+        self._last_input_display = None
+
+    def is_chat_dirty(self):
+        """
+        Returns True if the chat window content changed since the last redraw.
+        Unfinished messages with a pending animation glyph stay dirty so the
+        animation keeps ticking.
+        """
+        unfinished = self.chat_server.get_unfinished_messages()
+        unfinished_state = tuple(
+            (msg.sender.name if msg.sender else None,
+             msg.receiver.name if msg.receiver else None,
+             msg.content)
+            for msg in unfinished
+        )
+        animating = any(
+            msg.receiver is None or msg.content is None for msg in unfinished
+        )
+        dirty = (
+            animating
+            or len(self.chat_server.history.messages) != self._last_history_len
+            or unfinished_state != self._last_unfinished_state
+        )
+        if dirty:
+            self._last_history_len = len(self.chat_server.history.messages)
+            self._last_unfinished_state = unfinished_state
+        return dirty
+
+    def redraw_chat_window(self):
+        """
+        Clears and redraws the chat window with unfinished messages and history.
+        """
+        self._circle_frame = self.get_animated_circle()
         self.chat_win.clear()
         self.chat_win.border()
 
@@ -145,55 +314,71 @@ class ChatUI:
         for message in self.chat_server.get_unfinished_messages():
             y_offset = self.display_message(y_offset, message)
 
-        # Display chat history in reverse order
+        # Display chat history in reverse order, stopping once the window
+        # is full so redraw cost stays bounded by the screen, not by the
+        # total history length.
         for msg in reversed(self.chat_server.history.messages):
             y_offset = self.display_message(y_offset, msg)
+            if y_offset >= self.height - 4:
+                break
 
-        self.chat_win.refresh()
-
-        # Update input window
-        self.input_win.clear()
-        self.input_win.border()
-        input_display = "You: " + self.client.inbox_text[:self.width - 8]
-        self.input_win.addstr(1, 2, input_display, curses.color_pair(1))
-        self.input_win.refresh()
-
-        if self.input_mode:
-            key = self.input_win.getch()
-            if key == 10:  # Enter key
-                self.input_mode = False
-            elif key in (127, 8, curses.KEY_BACKSPACE):  # Backspace key
-                self.client.inbox_text = self.client.inbox_text[:-1]
-            elif 32 <= key <= 126 and len(self.client.inbox_text) < self.width - 8:  # Printable characters
-                self.client.inbox_text += chr(key)
-        
-        time.sleep(0.1)  # Small delay to control UI refresh rate
+        self.chat_win.noutrefresh()
 
     def display_message(self, y_offset, message):
         """
         Display a single message on the chat window at the given vertical offset.
         """
-        sender_name = message.sender.name if message.sender else ""
-        receiver_name = message.receiver.name if message.receiver else self.get_animated_circle()
-        content = message.content if message.content else self.get_animated_circle()
-
-        # Determine color pair based on sender index
-        try:
-            color_index = self.chat_server.chat_clients.index(message.sender) + 1
-        except ValueError:
-            color_index = 1
-        color = curses.color_pair(color_index)
-
-        indicator = f"[{pad_string(sender_name, 10)}  => {pad_string(receiver_name, 10)}]: "
-        full_text = indicator + content
-
-        # Split message into lines based on window width
-        lines = [full_text[i:i + self.width - 4] for i in range(0, len(full_text), self.width - 4)]
-
+        remaining = self.height - 4 - y_offset
+        if remaining <= 0:
+            return y_offset
+
+        content = message.content if message.content else self._circle_frame
+
+        color = self._color_pairs[self._client_color_idx.get(message.sender, 1)]
+
+        # Historical messages are immutable, so their indicator string can be
+        # computed once and cached on the message. Unfinished messages may
+        # still carry an animation glyph, so those are rebuilt each frame.
+        indicator = getattr(message, '_indicator', None)
+        if indicator is None:
+            sender_name = message.sender.name if message.sender else ""
+            receiver_name = message.receiver.name if message.receiver else self._circle_frame
+            indicator = f"[{sender_name:<10.10s}  => {receiver_name:<10.10s}]: "
+            if message.receiver is not None:
+                message._indicator = indicator
+        # Wrapped lines are cached on the message; history messages are
+        # immutable, so the split only has to happen again if the window
+        # width changes. Reused unfinished wrappers drop their caches when
+        # their content changes, and animated ones are never cached below.
+        lines = getattr(message, '_wrap_lines', None)
+        if lines is None or getattr(message, '_wrap_w', None) != self.width:
+            full_text = indicator + content
+            wrap_width = self._wrap_width
+            if message.receiver is not None and message.content:
+                # Fully-resolved messages wrap completely so the result can
+                # be cached and reused at any offset.
+                lines = [full_text[i:i + wrap_width] for i in range(0, len(full_text), wrap_width)]
+                message._wrap_lines = lines
+                message._wrap_w = self.width
+            else:
+                # Animated (uncacheable) messages only materialize the lines
+                # that still fit on screen.
+                lines = [
+                    full_text[i:i + wrap_width]
+                    for i in itertools.islice(range(0, len(full_text), wrap_width), remaining)
+                ]
+
+        # Hoist the attribute and bound-method lookups out of the per-line
+        # loop; this path runs for every visible line of every message.
+        # addnstr clips to the wrap width in C, so an over-long line can
+        # never spill past the border.
+        addnstr = self.chat_win.addnstr
+        wrap_width = self._wrap_width
+        limit = self.height - 4
         for line in lines:
-            if y_offset < self.height - 4:
+            if y_offset < limit:
                 try:
-                    self.chat_win.addstr(self.height - y_offset - 4, 2, line, color)
+                    addnstr(limit - y_offset, 2, line, wrap_width, color)
                 except curses.error:
                     pass  # Ignore if out-of-bounds
                 y_offset += 1
@@ -202,34 +387,47 @@ class ChatUI:
 
     def run(self):
         """
-        Continuously update the UI.
+        Continuously update the UI. The loop blocks on the server's redraw
+        event instead of sleeping a fixed interval; the timeout keeps
+        animations ticking while a message is pending.
         """
         while True:
             self.tick += 1
             self.update_ui()
+            if not self.input_mode:
+                self.chat_server.redraw_event.wait(timeout=0.25)
+                self.chat_server.redraw_event.clear()
 
     # --- Animation Helpers ---
+    # Frames are precomputed tuples indexed by tick instead of slicing a
+    # string per call; the "(tick % n) * 2" workaround for stepping over
+    # the spaces in the old separator-joined strings goes away with them.
+    _SPINNER_FRAMES = ('|', '/', '-', '\\')
+    _CROSS_FRAMES = ('┤', '┘', '┴', '└', '├', '┌', '┬', '┐')
+    _CLOCK_FRAMES = ('←', '↖', '↑', '↗', '→', '↘', '↓', '↙')
+    _CIRCLE_FRAMES = ('◴', '◷', '◶', '◵')
+    _BOUNCE_FRAMES = ('.', 'o', 'O', 'o')
+    _DOTS_FRAMES = tuple(
+        ' ' * i + '.' + ' ' * (4 - i) for i in range(5)
+    )
+
     def get_spinner(self):
-        return "|/-\\"[self.tick % 4]
+        return self._SPINNER_FRAMES[self.tick & 3]
 
     def get_cross(self):
-        # Unicode symbols may require adjustments; using simple text fallback here
-        return "┤ ┘ ┴ └ ├ ┌ ┬ ┐"[(self.tick % 8) * 2]
+        return self._CROSS_FRAMES[self.tick & 7]
 
     def get_clock(self):
-        return "← ↖ ↑ ↗ → ↘ ↓ ↙"[(self.tick % 8) * 2]
+        return self._CLOCK_FRAMES[self.tick & 7]
 
     def get_dots(self):
-        dot_length = 5
-        dots = [' '] * dot_length
-        dots[(self.tick // 2) % dot_length] = '.'
-        return "".join(dots)
+        return self._DOTS_FRAMES[(self.tick // 2) % 5]
 
     def get_animated_circle(self):
-        return "◴ ◷ ◶ ◵"[(self.tick % 4) * 2]
+        return self._CIRCLE_FRAMES[self.tick & 3]
 
     def get_bounce(self):
-        return ".oOo"[int(self.tick % 4)]
+        return self._BOUNCE_FRAMES[self.tick & 3]
 
     def get_active_client_name(self):
         names = [client.name for client in self.chat_server.chat_clients]
@@ -240,11 +438,40 @@ class ChatUI:
 # Chat History and Message Classes
 # ------------------------------------------------------------------------------
 
+# Translation table covering the five XML special characters; used when
+# serializing a single message without going through lxml.
+_XML_ESC = str.maketrans({
+    '&': '&amp;', '<': '&lt;', '>': '&gt;', "'": '&apos;', '"': '&quot;'
+})
+
+
+def _xml_escape(text):
+    return text.translate(_XML_ESC)
+
+
+# Best-effort parser for the fallback path: recover mode tolerates
+# fragments and unterminated tags in a single pass.
+_RECOVER_PARSER = ET.XMLParser(recover=True)
+
+
+# Fast-path pattern for the single <message from=... to=...> element the
+# agents exchange; handles complete, fragment, and unterminated forms alike.
+_MESSAGE_RE = re.compile(
+    r"<message\s+from=['\"]([^'\"]*)['\"]\s+to=['\"]([^'\"]*)['\"]\s*>(.*?)(?:</message>|$)",
+    re.DOTALL,
+)
+
+
 class Message:
     """
     Represents a message exchanged between chat clients.
+    Messages are allocated per streamed chunk as well as per history entry,
+    so __slots__ keeps them free of a per-instance __dict__.
     """
 
+    __slots__ = ('content', 'sender', 'receiver', 'chat_server',
+                 '_indicator', '_wrap_lines', '_wrap_w')
+
     def __init__(self, content, sender, receiver, chat_server):
         self.content = content
         self.sender = sender
@@ -265,26 +492,30 @@ class Message:
         """
         Parses an XML string to create a Message object.
         Handles full XML documents, fragments, and unfinished responses.
+        A compiled regex covers the common single-message shape in one pass;
+        the lxml attempts below remain as a fallback for anything odd.
         """
+        match = _MESSAGE_RE.search(xml_string)
+        if match is not None:
+            return Message(
+                content=html.unescape(match.group(3)),
+                sender=chat_server.get_client_by_name(match.group(1)),
+                receiver=chat_server.get_client_by_name(match.group(2)),
+                chat_server=chat_server
+            )
+
+        # Single recover-mode parse instead of the old ladder of three
+        # separate attempts; the wrapper tolerates fragments and the
+        # recovering parser tolerates an unterminated </message>.
         try:
-            return Message.from_xml_element(ET.fromstring(xml_string), chat_server)
+            wrapped = ET.fromstring(f"<chat>{xml_string}</chat>", _RECOVER_PARSER)
+            if wrapped is not None:
+                elem = wrapped.find("message")
+                if elem is not None:
+                    return Message.from_xml_element(elem, chat_server)
         except ET.ParseError:
             pass
 
-        # Try wrapping in a <chat> tag (for fragments)
-        try:
-            wrapped = ET.fromstring(f"<chat>{xml_string}</chat>")
-            return Message.from_xml_element(wrapped.find("message"), chat_server)
-        except (ET.ParseError, IndexError):
-            pass
-
-        # Try handling unfinished responses
-        try:
-            wrapped = ET.fromstring(f"<chat>{xml_string}</message></chat>")
-            return Message.from_xml_element(wrapped.find("message"), chat_server)
-        except (ET.ParseError, IndexError):
-            pass
-
         # If all parsing attempts fail, return an empty Message
         return Message(content=None, sender=None, receiver=None, chat_server=chat_server)
 
@@ -298,7 +529,76 @@ class Message:
         return elem
 
     def to_xml_string(self):
-        return ET.tostring(self.to_xml_element())
+        """
+        Serializes this message directly as a string; building and walking a
+        one-node lxml tree is needless overhead for a single known tag.
+        to_xml_element stays around for the history serializer.
+        """
+        attrs = ""
+        if self.receiver and self.receiver.name:
+            attrs += f" to='{_xml_escape(self.receiver.name)}'"
+        if self.sender and self.sender.name:
+            attrs += f" from='{_xml_escape(self.sender.name)}'"
+        content = _xml_escape(self.content) if self.content else ""
+        return f"<message{attrs}>{content}</message>"
+
+
+class StreamingMessageParser:
+    """
+    Incrementally extracts a single <message from=... to=...> element from a
+    streamed response. Each chunk is consumed exactly once, so total parsing
+    work stays linear in the response length instead of re-parsing the whole
+    growing buffer for every chunk.
+    """
+
+    _START_TAG_RE = re.compile(r"<message\b([^>]*)>")
+    _ATTR_RE = re.compile(r"(\w+)=['\"]([^'\"]*)['\"]")
+    _CLOSE_TAG = "</message>"
+
+    def __init__(self, chat_server):
+        self.chat_server = chat_server
+        self.buffer = ""
+        self.sender = None
+        self.receiver = None
+        self.content_start = None
+        self.complete = False
+
+    def feed(self, chunk):
+        """
+        Consumes the next chunk and returns the current (possibly partial)
+        Message, or None if no start tag has been seen yet.
+        """
+        if not self.complete:
+            self.buffer += chunk
+            if self.content_start is None:
+                match = self._START_TAG_RE.search(self.buffer)
+                if match is None:
+                    return None
+                attrs = dict(self._ATTR_RE.findall(match.group(1)))
+                self.sender = self.chat_server.get_client_by_name(attrs.get("from"))
+                self.receiver = self.chat_server.get_client_by_name(attrs.get("to"))
+                self.content_start = match.end()
+        return self.message()
+
+    def message(self):
+        """
+        Returns a Message built from the content parsed so far, or None if the
+        start tag has not arrived yet. Trailing fragments of the closing tag
+        are stripped so they never leak into the displayed content.
+        """
+        if self.content_start is None:
+            return None
+        content = self.buffer[self.content_start:]
+        close_index = content.find(self._CLOSE_TAG)
+        if close_index != -1:
+            content = content[:close_index]
+            self.complete = True
+        else:
+            for cut in range(min(len(self._CLOSE_TAG) - 1, len(content)), 0, -1):
+                if content.endswith(self._CLOSE_TAG[:cut]):
+                    content = content[:-cut]
+                    break
+        return Message(html.unescape(content), self.sender, self.receiver, self.chat_server)
 
 
 class ChatHistory:
@@ -306,8 +606,18 @@ class ChatHistory:
     Manages the chat history and provides methods for saving/loading from XML.
     """
 
+    __slots__ = ('messages', '_serialized_body', '_save_timer')
+
+    SAVE_DEBOUNCE = 0.5  # Seconds to coalesce bursts of appends into one write
+
     def __init__(self, messages):
         self.messages = messages
+        self._save_timer = None
+        # Serialized form of all messages, appended to incrementally so the
+        # prompt builder does not re-serialize the whole history every turn.
+        self._serialized_body = bytearray()
+        for msg in messages:
+            self._serialized_body += ET.tostring(msg.to_xml_element())
 
     def save(self):
         with open("chat_log.xml", "wb") as f:
@@ -315,9 +625,23 @@ class ChatHistory:
 
     @staticmethod
     def load(chat_server):
+        """
+        Streams messages out of chat_log.xml with iterparse, clearing each
+        element after use so peak memory stays constant regardless of how
+        large the log has grown.
+        """
         try:
-            xml_tree = ET.parse('chat_log.xml')
-            return ChatHistory.from_xml_element(xml_tree, chat_server)
+            messages = []
+            for _, elem in ET.iterparse('chat_log.xml', tag='message'):
+                messages.append(Message.from_xml_element(elem, chat_server))
+                elem.clear()
+                # Also drop already-consumed siblings still anchored to the
+                # root, so the partially built tree stays bounded.
+                parent = elem.getparent()
+                if parent is not None:
+                    while elem.getprevious() is not None:
+                        del parent[0]
+            return ChatHistory(messages)
         except ET.ParseError:
             return ChatHistory([])
 
@@ -338,12 +662,33 @@ class ChatHistory:
         return root
 
     def to_xml_string(self):
-        return ET.tostring(self.to_xml_element())
+        return b"<chat>" + bytes(self._serialized_body) + b"</chat>"
+
+    def recent_xml_string(self, count):
+        """
+        Serializes only the most recent 'count' messages, for callers (like
+        the prompt builder) that should not grow with the whole session.
+        """
+        recent = self.messages[-count:]
+        return "<chat>" + "".join(message.to_xml_string() for message in recent) + "</chat>"
 
     def append_message(self, sender, receiver, content):
-        self.messages.append(Message(content, sender, receiver, self))
-        # Optionally, uncomment the following line to save the history automatically
-        # self.save()
+        message = Message(content, sender, receiver, self)
+        self.messages.append(message)
+        self._serialized_body += ET.tostring(message.to_xml_element())
+        self._schedule_save()
+
+    def _schedule_save(self):
+        """
+        Persists the history on a debounce timer: bursts of appends within
+        the window collapse into a single file write instead of one full
+        serialization per message.
+        """
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(self.SAVE_DEBOUNCE, self.save)
+        self._save_timer.daemon = True
+        self._save_timer.start()
 
 
 # ------------------------------------------------------------------------------
@@ -357,25 +702,34 @@ class ChatServer:
 
     def __init__(self):
         self.chat_clients = []
+        self._clients_by_name = {}
         self.history = ChatHistory([])
+        # Signalled whenever chat content changes, so the UI thread can
+        # sleep instead of polling at a fixed rate.
+        self.redraw_event = threading.Event()
+        # The client currently composing a message (streaming agent or the
+        # typing user); lets the UI find unfinished content without scanning
+        # every client each frame.
+        self.streaming_client = None
         # Assign this chat server to each client (if already added)
         for client in self.chat_clients:
             client.chat_server = self
 
     def get_unfinished_messages(self):
         """
-        Returns a list of unfinished messages from all chat clients.
+        Returns a list of unfinished messages from the currently composing
+        client, if any.
         """
-        return [client.get_unfinished_message() for client in self.chat_clients if client.inbox_text != ""]
+        client = self.streaming_client
+        if client is None or not client._inbox_buf:
+            return []
+        return [client.get_unfinished_message()]
 
     def get_client_by_name(self, client_name):
         """
         Retrieves a chat client by its name.
         """
-        for client in self.chat_clients:
-            if client.name == client_name:
-                return client
-        return None
+        return self._clients_by_name.get(client_name)
 
     def add_client(self, name, fg_color, bg_color, on_receive_callback):
         """
@@ -383,6 +737,7 @@ class ChatServer:
         """
         new_client = ChatClient(name=name, fg_color=fg_color, bg_color=bg_color, chat_server=self, on_receive_callback=on_receive_callback)
         self.chat_clients.append(new_client)
+        self._clients_by_name[name] = new_client
         return new_client
 
     def load_history(self):
@@ -393,6 +748,10 @@ class ChatClient:
     Represents a participant in the chat.
     """
 
+    __slots__ = ('chat_server', 'name', 'foreground_color', 'background_color',
+                 '_inbox_buf', 'inbox_receiver', 'on_receive_callback', 'ui',
+                 '_unfinished')
+
     chat_clients = []
 
     def __init__(self, name, fg_color, bg_color, chat_server, on_receive_callback):
@@ -403,9 +762,38 @@ class ChatClient:
         self.inbox_text = ""
         self.inbox_receiver = None
         self.on_receive_callback = on_receive_callback  # Callback function when a message is received
+        self._unfinished = None  # Reused Message wrapper for in-progress content
 
         self.chat_clients.append(self)
 
+    @property
+    def inbox_text(self):
+        """
+        The inbox content as a string. The text is kept as a list of
+        characters so per-keystroke edits are O(1) instead of rebuilding an
+        immutable string.
+        """
+        return "".join(self._inbox_buf)
+
+    @inbox_text.setter
+    def inbox_text(self, value):
+        # A failed final parse can publish None; treat it as empty.
+        self._inbox_buf = list(value) if value else []
+
+    def append_inbox_char(self, character):
+        """
+        Appends a single typed character to the inbox buffer.
+        """
+        self._inbox_buf.append(character)
+        self.chat_server.streaming_client = self
+
+    def pop_inbox_char(self):
+        """
+        Removes the last character from the inbox buffer, if any.
+        """
+        if self._inbox_buf:
+            self._inbox_buf.pop()
+
     def send_message(self):
         """
         Sends the current message from the client's inbox and appends it to chat history.
@@ -416,6 +804,10 @@ class ChatClient:
         # Clear inbox after sending
         self.inbox_text = ""
         self.inbox_receiver = None
+        self._unfinished = None
+        if self.chat_server.streaming_client is self:
+            self.chat_server.streaming_client = None
+        self.chat_server.redraw_event.set()
         receiver.on_receive_callback(receiver, self, content)
 
     def update_inbox(self, receiver, content):
@@ -424,12 +816,26 @@ class ChatClient:
         """
         self.inbox_receiver = receiver
         self.inbox_text = content
+        self.chat_server.streaming_client = self
+        self.chat_server.redraw_event.set()
 
     def get_unfinished_message(self):
         """
         Returns a Message object for the current unfinished inbox content.
+        The wrapper object is reused across frames; its render caches are
+        dropped whenever the content or receiver changed underneath it.
         """
-        return Message(self.inbox_text, self, self.inbox_receiver, self.chat_server)
+        message = self._unfinished
+        content = self.inbox_text
+        if message is None:
+            message = Message(content, self, self.inbox_receiver, self.chat_server)
+            self._unfinished = message
+        elif message.content != content or message.receiver is not self.inbox_receiver:
+            message.content = content
+            message.receiver = self.inbox_receiver
+            message._indicator = None
+            message._wrap_lines = None
+        return message
 
     def load_ui(self, stdscr):
         """
@@ -478,13 +884,77 @@ class ChatbotAgent(ChatAgent):
     Chatbot agent that generates responses using a local AI model.
     """
 
-    def __init__(self, chat_server, name, user_client, terminal_client, model_name):
+    def __init__(self, chat_server, name, user_client, terminal_client, model_name, history_window=20):
+        # Imported here rather than at module level: the langchain stack is
+        # expensive to load and only needed once a chatbot is created.
+        from langchain_core.prompts import ChatPromptTemplate  # Chat prompt template
+        from langchain_community.chat_models import ChatOllama  # Chat model for streaming responses
+
         super().__init__(name=name, fg_color=curses.COLOR_MAGENTA, chat_server=chat_server)
         self.model = ChatOllama(model=model_name, streaming=True)
-        self.prompt_template = ChatPromptTemplate.from_template(CHATBOT_PROMPT_TEMPLATE)
+        # The participant names never change, so bind them once instead of
+        # re-substituting them on every call.
+        self.prompt_template = ChatPromptTemplate.from_template(CHATBOT_PROMPT_TEMPLATE).partial(
+            chatbot_name=name,
+            user_name=user_client.name,
+            terminal_name=terminal_client.name,
+        )
         self.chain = self.prompt_template | self.model
         self.user_client = user_client
         self.terminal_client = terminal_client
+        # Number of trailing history messages included in each prompt, so
+        # per-turn model latency stays bounded on long sessions.
+        self.history_window = history_window
+        # Publish throttle state, used to decouple the LLM token rate from
+        # the UI refresh rate: flush on elapsed time or accumulated size.
+        self._last_publish = 0.0
+        self._last_publish_len = 0
+
+    @staticmethod
+    def _coalesced_chunks(source, window=0.02):
+        """
+        Groups streamed text pieces into ~20 ms windows so the downstream
+        parse/publish pipeline runs per window instead of per token.
+        """
+        buffer = []
+        window_start = time.monotonic()
+        for text in source:
+            buffer.append(text)
+            now = time.monotonic()
+            if now - window_start > window:
+                yield "".join(buffer)
+                buffer.clear()
+                window_start = now
+        if buffer:
+            yield "".join(buffer)
+
+    def _stream_tokens(self, prompt_inputs):
+        """
+        Pulls tokens from the model on a producer thread and yields their
+        text from a bounded queue, so parsing and UI publishing on this
+        thread never stall the HTTP stream between tokens.
+        """
+        token_queue = queue.Queue(maxsize=64)
+
+        def produce():
+            # Always terminate the queue, even when the stream fails (e.g.
+            # Ollama unreachable); the consumer re-raises the error so it
+            # surfaces in the chat thread instead of hanging it.
+            try:
+                for chunk in self.chain.stream(prompt_inputs):
+                    token_queue.put(chunk.content)
+                token_queue.put(None)
+            except BaseException as error:
+                token_queue.put(error)
+
+        threading.Thread(target=produce, daemon=True).start()
+        while True:
+            text = token_queue.get()
+            if text is None:
+                return
+            if isinstance(text, BaseException):
+                raise text
+            yield text
 
     def receive_message(self, sender, content):
         """
@@ -492,24 +962,40 @@ class ChatbotAgent(ChatAgent):
         and sends the final response.
         """
         incoming_message = Message(content, self.client, sender, self.client.chat_server)
-        raw_response = ""
-
-        # Stream the AI response in chunks
-        for chunk in self.chain.stream({
-            "chatbot_name": self.client.name,
-            "user_name": self.user_client.name,
-            "terminal_name": self.terminal_client.name,
-            "history": self.client.chat_server.history.to_xml_string(),
+        # Chunks are kept as a list and only joined if the fallback parse
+        # needs the full text, avoiding repeated string reallocation.
+        response_parts = []
+        response_len = 0
+        parser = StreamingMessageParser(self.client.chat_server)
+        self._last_publish_len = 0
+
+        # Stream the AI response in coalesced windows, feeding each piece to
+        # the incremental parser exactly once.
+        for text in self._coalesced_chunks(self._stream_tokens({
+            "history": self.client.chat_server.history.recent_xml_string(self.history_window),
             "message": incoming_message.to_xml_string()
-        }):
-            raw_response += chunk.content
-            parsed_chunk = Message.from_xml_string(raw_response, self.client.chat_server)
-            if parsed_chunk.content is not None:
+        })):
+            response_parts.append(text)
+            response_len += len(text)
+            parsed_chunk = parser.feed(text)
+            # Coalesce intermediate updates: fast streams can deliver far
+            # more chunks per second than the UI ever draws, so only
+            # publish every 50 ms, or sooner if a large burst (>= 32 chars)
+            # arrived in one go. The final state is always sent below.
+            now = time.monotonic()
+            if (parsed_chunk is not None and parsed_chunk.content is not None
+                    and (now - self._last_publish > 0.05
+                         or response_len - self._last_publish_len > 32)):
                 # Use edgy text animation for intermediate updates
                 self.client.update_inbox(parsed_chunk.receiver, generate_edgy_text(parsed_chunk.content))
-
-        # Send the final response
-        final_response = Message.from_xml_string(raw_response, self.client.chat_server)
+                self._last_publish = now
+                self._last_publish_len = response_len
+
+        # Send the final response; fall back to the full parser if the
+        # response never contained a well-formed start tag.
+        final_response = parser.message()
+        if final_response is None:
+            final_response = Message.from_xml_string("".join(response_parts), self.client.chat_server)
         self.client.update_inbox(final_response.receiver, final_response.content)
         self.client.send_message()
 
@@ -526,10 +1012,11 @@ class UserAgent(ChatAgent):
         """
         Activates the UI input mode to capture user input.
         """
-        self.client.inbox_receiver=sender
+        self.client.inbox_receiver = sender
+        self.client.ui.input_done.clear()
         self.client.ui.input_mode = True
-        while self.client.ui.input_mode:
-            time.sleep(0.1)
+        # Block until the UI thread signals that the user pressed Enter
+        self.client.ui.input_done.wait()
         self.client.send_message()
 
 
@@ -538,15 +1025,31 @@ class TerminalAgent(ChatAgent):
     Agent that executes terminal commands and returns the output.
     """
 
+    COMMAND_TIMEOUT = 60  # Seconds before a runaway command is aborted
+
     def __init__(self, chat_server):
         super().__init__(name="terminal", fg_color=curses.COLOR_GREEN, chat_server=chat_server)
 
     def receive_message(self, sender, content):
         """
         Executes the received command and returns the command output and errors.
+        The command is run without an intermediate shell, so there is no
+        second fork/reparse per command, and a timeout keeps a hung command
+        from blocking the chat thread forever.
         """
-        process = subprocess.Popen([content], stdout=subprocess.PIPE, shell=True)
-        stdout, stderr = process.communicate()
+        argv = shlex.split(content) if content else []
+        if not argv:
+            # subprocess.run([]) raises IndexError; an empty command is
+            # plausible model output and should just report as an error.
+            stdout, stderr = b"", b"empty command"
+        else:
+            try:
+                completed = subprocess.run(argv, capture_output=True, timeout=self.COMMAND_TIMEOUT)
+                stdout, stderr = completed.stdout, completed.stderr
+            except subprocess.TimeoutExpired:
+                stdout, stderr = b"", f"command timed out after {self.COMMAND_TIMEOUT}s".encode()
+            except (OSError, ValueError) as error:
+                stdout, stderr = b"", str(error).encode()
         response_text = f"Output: '{stdout}', Errors: '{stderr}'"
         self.client.update_inbox(sender, response_text)
         self.client.send_message()